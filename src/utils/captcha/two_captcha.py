@@ -1,197 +1,513 @@
 import base64
 import os
+import threading
 import time
 import traceback
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from types import LambdaType
 from typing import Dict
+from urllib.parse import parse_qs, urlparse
 
+import requests
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException as SeleniumTimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from twocaptcha import TwoCaptcha
-from twocaptcha.api import ApiException, NetworkException
+from twocaptcha.api import ApiClient, ApiException, NetworkException
 from twocaptcha.solver import TimeoutException
 
-from src.utils.common import selenium_common, utils
+from src.utils.common import selenium_common
 from src.utils.log import Log
 
 import json
 import re
 
-DEFAULT_CONFIG = {"api_key": None, "enabled": True, "debug_mode": True}
+DEFAULT_CONFIG = {
+    "api_key": None,
+    "enabled": True,
+    "debug_mode": True,
+    "pingback_url": None,
+    "pingback_host": "127.0.0.1",
+    "pingback_port": 8080,
+}
+PINGBACK_POLL_INTERVAL = 30
+
+_INTERCEPT_RE = re.compile(r"intercepted-params:(\{[^}]*\})")
+
+# Hooks turnstile.render to capture its params, exposed on window and logged to the console.
+# Wrapped in an IIFE so nothing leaks into the page's global scope when registered over CDP
+_INTERCEPT_SCRIPT = """
+    (() => {
+        console.clear = () => console.log('Console was cleared')
+        const i = setInterval(()=>{
+            if (window.turnstile) {
+                clearInterval(i)
+                window.turnstile.render = (a,b) => {
+                    let params = {
+                        sitekey: b.sitekey,
+                        pageurl: window.location.href,
+                        data: b.cData,
+                        pagedata: b.chlPageData,
+                        action: b.action,
+                        userAgent: navigator.userAgent,
+                    }
+                    window.interceptedParams = params
+                    console.log('intercepted-params:' + JSON.stringify(params))
+                    window.cfCallback = b.callback
+                    return
+                }
+            }
+        },50)
+    })()
+"""
+_READ_PARAMS_JS = "return window.interceptedParams || null;"
+
+# Fetches the captcha image src and input element in a single driver round-trip
+_NORMAL_CAPTCHA_LOOKUP_JS = """
+    const img = document.getElementById('ctl00_ContentPlaceHolder1_CaptchaImg');
+    const input = document.getElementById('ctl00_ContentPlaceHolder1_txtVerificationCode');
+    return [img ? img.src : null, input];
+"""
+
+# Values are passed as script arguments so the source stays constant across calls
+_SET_VALUE_JS = "arguments[0].value = arguments[1];"
+_CF_CALLBACK_JS = "cfCallback(arguments[0]);"
+
+
+def _parse_turnstile(message: str, start: int):
+    match = _INTERCEPT_RE.match(message, start)
+    if not match:
+        return None
+    # Chrome escapes the logged string, so only unescape the matched slice
+    json_string = match.group(1).replace('\\"', '"').replace("\\\\", "\\")
+    try:
+        return json.loads(json_string)
+    except json.JSONDecodeError:
+        log_entry = message.encode("utf-8").decode("unicode_escape")
+        match = _INTERCEPT_RE.search(log_entry)
+        if match:
+            try:
+                return json.loads(match.group(1))
+            except json.JSONDecodeError:
+                pass
+    return None
+
+
+# Log markers mapped to their parsers, add an entry here to intercept another captcha type
+_LOG_HANDLERS = {
+    "intercepted-params:": _parse_turnstile,
+}
+# One combined pass finds whichever marker a line holds, however many handlers there are
+_LOG_MARKER_RE = re.compile("|".join(re.escape(key) for key in _LOG_HANDLERS))
+
+
+def _extract_params(logs):
+    # The intercepted params are usually the latest entry, so scan newest-first
+    for log in reversed(logs):
+        # Chrome tags console.log output as INFO
+        if log.get("level") != "INFO":
+            continue
+        message = log["message"]
+        marker = _LOG_MARKER_RE.search(message)
+        if not marker:
+            continue
+        params = _LOG_HANDLERS[marker.group(0)](message, marker.start())
+        if params:
+            return params
+    return None
+
+
+class _SessionApiClient(ApiClient):
+    """
+    ApiClient that reuses a keep-alive requests.Session instead of opening a new
+    connection to 2Captcha for every in.php / res.php call.
+    """
+
+    def __init__(self, session: requests.Session, post_url: str = "2captcha.com"):
+        super().__init__(post_url=post_url)
+        self.session = session
+
+    @staticmethod
+    def _read_response(resp):
+        if resp.status_code != 200:
+            raise NetworkException(f"bad response: {resp.status_code}")
+
+        resp = resp.content.decode("utf-8")
+        if "ERROR" in resp:
+            raise ApiException(resp)
+
+        return resp
+
+    def in_(self, files={}, **kwargs):
+        current_url = f"https://{self.post_url}/in.php"
+        try:
+            if files:
+                files = {key: open(path, "rb") for key, path in files.items()}
+                try:
+                    resp = self.session.post(current_url, data=kwargs, files=files)
+                finally:
+                    [f.close() for f in files.values()]
+            elif "file" in kwargs:
+                with open(kwargs.pop("file"), "rb") as f:
+                    resp = self.session.post(
+                        current_url, data=kwargs, files={"file": f}
+                    )
+            else:
+                resp = self.session.post(current_url, data=kwargs)
+        except requests.RequestException as e:
+            raise NetworkException(e)
+
+        return self._read_response(resp)
+
+    def res(self, **kwargs):
+        try:
+            resp = self.session.get(f"https://{self.post_url}/res.php", params=kwargs)
+        except requests.RequestException as e:
+            raise NetworkException(e)
+
+        return self._read_response(resp)
+
+
+class _PingbackHandler(BaseHTTPRequestHandler):
+    """
+    Receives 2Captcha pingback requests (id=...&code=...) and hands them to the
+    server's on_result callback.
+    """
+
+    def _handle(self, query: str):
+        params = parse_qs(query)
+        captcha_id = params.get("id", [None])[0]
+        code = params.get("code", [None])[0]
+        if captcha_id and code is not None:
+            self.server.on_result(captcha_id, code)
+
+        self.send_response(200)
+        self.end_headers()
+
+    def do_GET(self):
+        self._handle(urlparse(self.path).query)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self._handle(self.rfile.read(length).decode("utf-8"))
+
+    def log_message(self, format, *args):
+        pass
 
 
 class Captcha:
     def __init__(self, log: Log, config: Dict = DEFAULT_CONFIG):
+        self._solved_dir = "solved_captchas"
+        if log.config["save_solved_captchas"]:
+            os.makedirs(self._solved_dir, exist_ok=True)
+
         solver = TwoCaptcha(apiKey=config["api_key"])
+
+        # Share one pooled keep-alive session across all 2Captcha requests
+        self._session = requests.Session()
+        self._session.headers["Connection"] = "keep-alive"
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._session.mount("https://", adapter)
+        solver.api_client = _SessionApiClient(
+            self._session, post_url=solver.api_client.post_url
+        )
+
         self.solver = solver
         self.log = log
         self.enabled = config["enabled"]
         self.debug_enabled = config["debug_mode"]
+        self._sitekey_cache: Dict[str, str] = {}
+
+        self._executor = ThreadPoolExecutor(max_workers=4)
+        # Weakly keyed so Futures the caller drops without finish_async() do not pin their WebElements
+        self._async_callbacks = weakref.WeakKeyDictionary()
+
+        self._pingback_url = config.get("pingback_url")
+        self._pingback_server = None
+        self._pending: Dict[str, str] = {}
+        self._events: Dict[str, threading.Event] = {}
+        self._events_lock = threading.Lock()
+        if self._pingback_url:
+            self._start_pingback_server(
+                config.get("pingback_host", "127.0.0.1"),
+                config.get("pingback_port", 8080),
+            )
 
-    def _solve_captcha(
-        self,
-        solve_callback: LambdaType,
-        result_callback: LambdaType,
-        debug_enabled: bool,
-    ):
-        result = None
+    def _start_pingback_server(self, host: str, port: int):
+        try:
+            server = ThreadingHTTPServer((host, int(port)), _PingbackHandler)
+        except OSError as e:
+            self.log.error(f"Could not start 2Captcha pingback server, polling instead: {e}")
+            self._pingback_url = None
+            return
+
+        server.on_result = self._on_pingback
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self._pingback_server = server
+
+    def _register_event(self, captcha_id: str):
+        with self._events_lock:
+            return self._events.setdefault(captcha_id, threading.Event())
+
+    def _on_pingback(self, captcha_id: str, code: str):
+        # Only accept answers for captchas this process is still waiting on
+        with self._events_lock:
+            event = self._events.get(captcha_id)
+            if event is None:
+                return
+            self._pending[captcha_id] = code
+        event.set()
+
+    def _submit(self, poll_callback: LambdaType, **params):
+        """
+        Sends the captcha to 2Captcha and waits for the pingback with the answer.
+        Falls back to poll_callback when no pingback url is configured. While waiting,
+        res.php is checked every PINGBACK_POLL_INTERVAL seconds in case the pingback
+        is lost or arrived before the captcha id was registered.
+        """
+        if not self._pingback_url:
+            return poll_callback()
+
+        captcha_id = self.solver.send(callback=self._pingback_url, **params)
+        timeout = (
+            self.solver.recaptcha_timeout
+            if params.get("method") == "userrecaptcha"
+            else self.solver.default_timeout
+        )
+        deadline = time.monotonic() + timeout
+        event = self._register_event(captcha_id)
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutException(f"timeout {timeout} exceeded")
+
+                if event.wait(timeout=min(PINGBACK_POLL_INTERVAL, remaining)):
+                    code = self._pending.pop(captcha_id)
+                    # Failures are pushed the same way, e.g. ERROR_CAPTCHA_UNSOLVABLE
+                    if code.startswith("ERROR"):
+                        raise ApiException(code)
+                    break
+
+                try:
+                    code = self.solver.get_result(captcha_id)
+                    break
+                except NetworkException:
+                    pass  # Not ready yet
+        finally:
+            with self._events_lock:
+                self._events.pop(captcha_id, None)
+                self._pending.pop(captcha_id, None)
+
+        return {"captchaId": captcha_id, "code": code}
+
+    def _request_solution(self, solve_callback: LambdaType, debug_enabled: bool):
         try:
             result = solve_callback()
             self.log.debug_if(debug_enabled, "Received 2Captcha response...")
         except TimeoutException as e:
             self.log.debug_if(debug_enabled, f"2Captcha API has timed-out! : {str(e)}")
-            result = (False, "TIMEOUT", e)
+            return False, "TIMEOUT", e
         except NetworkException as e:
             self.log.debug_if(
                 debug_enabled,
                 f"2Captcha API has encountered a network error! : {str(e)}",
             )
-            result = (False, "NETWORK_ERROR", e)
+            return False, "NETWORK_ERROR", e
         except ApiException as e:
             self.log.debug_if(
                 debug_enabled, f"2Captcha API has encountered an API error : {str(e)}"
             )
-            result = (False, "API_ERROR", e)
+            return False, "API_ERROR", e
         except Exception as e:
-            self.log.error(e)
-            self.log.error(traceback.format_exc())
-            result = (False, "UNKNOWN_ERROR", e)
-        else:
+            if self.log.is_error_enabled():
+                self.log.error(f"2Captcha solve failed with an unknown error : {e}")
+                if debug_enabled:
+                    self.log.error(traceback.format_exc())
+            return False, "UNKNOWN_ERROR", e
+
+        return True, "SOLVED", result
+
+    def _apply_solution(
+        self, outcome: tuple, result_callback: LambdaType, debug_enabled: bool
+    ):
+        success, _, result = outcome
+        if success:
             result_callback(result)
-            result = (True, "SOLVED", result)
-        finally:
-            self.log.debug_if(debug_enabled, result)
-            return result
 
-    def save_captcha(self, driver: webdriver, captcha_image_filepath: str):
-        captcha_element = selenium_common.is_elem_present(
-            driver, By.ID, "ctl00_ContentPlaceHolder1_CaptchaImg"
-        )
-        captcha_input = selenium_common.is_elem_present(
-            driver, By.ID, "ctl00_ContentPlaceHolder1_txtVerificationCode"
-        )
+        self.log.debug_if(debug_enabled, outcome)
+        return outcome
 
-        if captcha_element and captcha_input:
-            img_base64_str = captcha_element.get_attribute("src")[23:]
-            img_base64 = str.encode(img_base64_str)
+    def _solve_captcha(
+        self,
+        solve_callback: LambdaType,
+        result_callback: LambdaType,
+        debug_enabled: bool,
+    ):
+        outcome = self._request_solution(solve_callback, debug_enabled)
+        return self._apply_solution(outcome, result_callback, debug_enabled)
 
-            with open(captcha_image_filepath, "wb") as image_file:
-                image_file.write(base64.decodebytes(img_base64))
+    def _read_captcha(self, driver: webdriver):
+        captcha_src, captcha_input = driver.execute_script(_NORMAL_CAPTCHA_LOOKUP_JS)
 
-            return captcha_input
+        if captcha_src and captcha_input:
+            # Strip the "data:image/...;base64," prefix, whatever its length
+            _, _, img_base64_str = captcha_src.partition(",")
+            if img_base64_str:
+                return img_base64_str, captcha_input
 
-        return False
+        return None, False
+
+    def _write_captcha_image(self, captcha_image_filepath: str, img_base64_str: str):
+        fd = os.open(captcha_image_filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, base64.b64decode(img_base64_str))
+        finally:
+            os.close(fd)
+
+    def save_captcha(self, driver: webdriver, captcha_image_filepath: str):
+        img_base64_str, captcha_input = self._read_captcha(driver)
 
-    def normal_captcha(self, driver: webdriver, page_url: str, debug_enabled: bool):
-        captcha_image_filepath = os.path.join("temp", "normal_captcha.jpeg")
-        captcha_input = self.save_captcha(driver, captcha_image_filepath)
         if captcha_input:
-            success, status, msg = self._solve_captcha(
-                solve_callback=lambda: self.solver.normal(
-                    captcha_image_filepath, caseSensitive=1, minLength=6, maxLength=6
-                ),
-                result_callback=lambda result: captcha_input.send_keys(
-                    str(result["code"])
+            self._write_captcha_image(captcha_image_filepath, img_base64_str)
+
+        return captcha_input
+
+    def _prepare_normal_captcha(self, driver: webdriver, page_url: str):
+        img_base64_str, captcha_input = self._read_captcha(driver)
+        if not captcha_input:
+            return None
+
+        def solve_callback():
+            # The image goes to 2Captcha as base64, no temp file round-trip needed
+            return self._submit(
+                lambda: self.solver.normal(
+                    img_base64_str, caseSensitive=1, minLength=6, maxLength=6
                 ),
-                debug_enabled=debug_enabled,
+                method="base64",
+                body=img_base64_str,
+                caseSensitive=1,
+                minLength=6,
+                maxLength=6,
             )
 
-            if (
-                self.log.config["save_solved_captchas"]
-                and success
-                and status == "SOLVED"
-            ):
-                os.rename(
-                    captcha_image_filepath,
-                    os.path.join("solved_captchas", f"{msg['code']}.jpeg"),
+        def result_callback(result):
+            captcha_input.send_keys(str(result["code"]))
+            if self.log.config["save_solved_captchas"]:
+                self._write_captcha_image(
+                    os.path.join(self._solved_dir, f"{result['code']}.jpeg"),
+                    img_base64_str,
                 )
-            else:
-                utils.remove_files([captcha_image_filepath])
 
-            return success, status, msg
+        return solve_callback, result_callback
+
+    def normal_captcha(self, driver: webdriver, page_url: str, debug_enabled: bool):
+        prepared = self._prepare_normal_captcha(driver, page_url)
+        if prepared:
+            return self._solve_captcha(*prepared, debug_enabled=debug_enabled)
 
         return False, "NO CAPTCHA FOUND IN", page_url
 
-    def recaptcha_v2(self, driver: webdriver, page_url: str, debug_enabled: bool):
-        def submit_captcha_response(driver, result):
+    def _prepare_recaptcha_v2(self, driver: webdriver, page_url: str):
+        site_key = self._sitekey_cache.get(page_url)
+        if site_key:
+            # Only the attribute value is cached, the widget must still be on the page
+            if not driver.find_elements(By.CSS_SELECTOR, "[data-sitekey]"):
+                return None
+        else:
+            site_key_element = selenium_common.is_elem_present(
+                driver, By.CSS_SELECTOR, "[data-sitekey]"
+            )
+            if not site_key_element:
+                return None
+            site_key = site_key_element.get_attribute("data-sitekey")
+            self._sitekey_cache[page_url] = site_key
+
+        def submit_captcha_response(result):
             recaptcha_repsonse_element = driver.find_element(
                 By.ID, "g-recaptcha-response"
             )
             driver.execute_script(
-                f'arguments[0].value="{result["code"]}"', recaptcha_repsonse_element
+                _SET_VALUE_JS, recaptcha_repsonse_element, result["code"]
             )
 
-        site_key_element = selenium_common.is_elem_present(
-            driver, By.CSS_SELECTOR, "[data-sitekey]"
+        return (
+            lambda: self._submit(
+                lambda: self.solver.recaptcha(sitekey=site_key, url=page_url),
+                method="userrecaptcha",
+                googlekey=site_key,
+                url=page_url,
+            ),
+            # lambda result: driver.execute_script(
+            #     """document.querySelector('[id="g-recaptcha-response"]').innerText = '{}'""".format(
+            #         str(result["code"])
+            #     )
+            # ),
+            submit_captcha_response,
         )
-        if site_key_element:
-            site_key = site_key_element.get_attribute("data-sitekey")
-            return self._solve_captcha(
-                solve_callback=lambda: self.solver.recaptcha(
-                    sitekey=site_key, url=page_url
-                ),
-                # result_callback=lambda result: driver.execute_script(
-                #     """document.querySelector('[id="g-recaptcha-response"]').innerText = '{}'""".format(
-                #         str(result["code"])
-                #     )
-                # ),
-                result_callback=lambda result: submit_captcha_response(driver, result),
-                debug_enabled=debug_enabled,
-            )
+
+    def recaptcha_v2(self, driver: webdriver, page_url: str, debug_enabled: bool):
+        prepared = self._prepare_recaptcha_v2(driver, page_url)
+        if prepared:
+            return self._solve_captcha(*prepared, debug_enabled=debug_enabled)
 
         return False, "NO RECAPTCHA_V2 FOUND IN", page_url
 
-    def get_captcha_params(self, driver: webdriver):
+    def _load_page(self, driver: webdriver, url: str = None):
+        if url:
+            driver.get(url)
+        else:
+            driver.refresh()
+
+    def get_captcha_params(
+        self, driver: webdriver, url: str = None, debug_enabled: bool = False
+    ):
         """
-        Refreshes the page, injects a JavaScript script to intercept Turnstile parameters, and retrieves them.
+        Injects a JavaScript script to intercept Turnstile parameters, (re)loads the page, and retrieves them.
+
+        On Chromium drivers the script is registered over CDP so it runs before the page renders,
+        and the parameters are read back from the page instead of the browser logs.
 
         Args:
-            script (str): The JavaScript code to be injected.
+            url (str): The page to open. If not given, the current page is refreshed.
 
         Returns:
             dict: The intercepted Turnstile parameters as a dictionary.
         """
-        intercept_script = """ 
-            console.clear = () => console.log('Console was cleared')
-            const i = setInterval(()=>{
-            if (window.turnstile)
-            console.log('success!!')
-            {clearInterval(i)
-                window.turnstile.render = (a,b) => {
-                let params = {
-                        sitekey: b.sitekey,
-                        pageurl: window.location.href,
-                        data: b.cData,
-                        pagedata: b.chlPageData,
-                        action: b.action,
-                        userAgent: navigator.userAgent,
-                    }
-                    console.log('intercepted-params:' + JSON.stringify(params))
-                    window.cfCallback = b.callback
-                    return        } 
-            }
-        },50)    
-        """
-
-        driver.refresh()  # Refresh the page to ensure the script is applied correctly
-
-        driver.execute_script(intercept_script)  # Inject the interception script
+        if hasattr(driver, "execute_cdp_cmd"):
+            script_id = driver.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": _INTERCEPT_SCRIPT}
+            )["identifier"]
+            try:
+                self._load_page(driver, url)
+                params = WebDriverWait(driver, 10, poll_frequency=0.25).until(
+                    lambda d: d.execute_script(_READ_PARAMS_JS)
+                )
+            except SeleniumTimeoutException:
+                return None
+            finally:
+                driver.execute_cdp_cmd(
+                    "Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id}
+                )
+        else:
+            self._load_page(driver, url)
 
-        time.sleep(5)  # Allow some time for the script to execute
+            driver.get_log("browser")  # Drain the log buffer of pre-refresh entries
+            driver.execute_script(_INTERCEPT_SCRIPT)  # Inject the interception script
 
-        logs = driver.get_log("browser")  # Retrieve the browser logs
-        params = None
-        for log in logs:
-            if "intercepted-params:" in log["message"]:
-                log_entry = log["message"].encode("utf-8").decode("unicode_escape")
-                match = re.search(r"intercepted-params:({.*?})", log_entry)
-                if match:
-                    json_string = match.group(1)
-                    params = json.loads(json_string)
-                    break
-        print("Parameters received")
+            try:
+                # get_log drains the buffer, so each poll only scans the new entries
+                params = WebDriverWait(driver, 10, poll_frequency=0.25).until(
+                    lambda d: _extract_params(d.get_log("browser"))
+                )
+            except SeleniumTimeoutException:
+                return None
+        self.log.debug_if(debug_enabled, "Parameters received")
         return params
 
     def cf_solver_captcha(self, params, debug_enabled: bool):
@@ -206,7 +522,7 @@ class Captcha:
         """
 
         try:
-            result = self.solver.turnstile(
+            turnstile_params = dict(
                 sitekey=params["sitekey"],
                 url=params["pageurl"],
                 action=params["action"],
@@ -214,26 +530,34 @@ class Captcha:
                 pagedata=params["pagedata"],
                 useragent=params["userAgent"],
             )
+            result = self._submit(
+                lambda: self.solver.turnstile(**turnstile_params),
+                method="turnstile",
+                **turnstile_params,
+            )
             self.log.debug_if(debug_enabled, f"Captcha solved")
             return result["code"]
         except Exception as e:
-            print(f"An error occurred: {e}")
+            self.log.debug_if(debug_enabled, f"An error occurred: {e}")
             return None
 
-    def send_token_callback(self, driver: webdriver, token):
+    def send_token_callback(
+        self, driver: webdriver, token, debug_enabled: bool = False
+    ):
         """
         Executes the callback function with the given token.
 
         Args:
             token (str): The solved captcha token.
         """
-        script = f"cfCallback('{token}')"
-        driver.execute_script(script)
-        print("The token is sent to the callback function")
+        driver.execute_script(_CF_CALLBACK_JS, token)
+        self.log.debug_if(debug_enabled, "The token is sent to the callback function")
 
-    def cf_final_message(self, driver: webdriver, locator):
+    def cf_final_message(
+        self, driver: webdriver, locator, debug_enabled: bool = False
+    ):
         """
-        Retrieves and prints the final success message.
+        Retrieves and logs the final success message.
 
         Args:
             locator (str): The XPath locator of the success message.
@@ -243,22 +567,93 @@ class Captcha:
             .until(EC.element_to_be_clickable((By.XPATH, locator)))
             .text
         )
-        print(message)
+        self.log.debug_if(debug_enabled, message)
 
-    def cloudflare_turnstile(self, driver: webdriver, debug_enabled: bool):
-        params = self.get_capture_params(driver)
+    def cloudflare_turnstile(
+        self, driver: webdriver, debug_enabled: bool = None, url: str = None
+    ):
+        debug_enabled = self.debug_enabled if debug_enabled is None else debug_enabled
+        params = self.get_captcha_params(driver, url, debug_enabled)
 
         if params:
             token = self.cf_solver_captcha(params, debug_enabled)
 
             if token:
-                self.send_token_callback(token)
-                self.cf_final_message(driver, "//p[contains(@class,'successMessage')]")
+                self.send_token_callback(driver, token, debug_enabled)
+                self.cf_final_message(
+                    driver, "//p[contains(@class,'successMessage')]", debug_enabled
+                )
                 time.sleep(5)
+                return True, "Solved Cloudflare turnstile"
             else:
-                print("Failed to solve Cloudflare turnstile")
+                self.log.debug_if(debug_enabled, "Failed to solve Cloudflare turnstile")
+                return False, "Failed to solve Cloudflare turnstile"
         else:
-            print("Cloudflare turnstile: failed to intercept parameters")
+            self.log.debug_if(
+                debug_enabled, "Cloudflare turnstile: failed to intercept parameters"
+            )
+            return False, "Cloudflare turnstile: failed to intercept parameters"
+
+    def solve_async(
+        self,
+        driver: webdriver,
+        captcha_type: str = None,
+        page_url: str = None,
+        force_enable: bool = False,
+        force_debug: bool = False,
+    ) -> Future:
+        """
+        Reads the captcha off the page on the calling thread and sends only the
+        2Captcha request to a worker thread.
+
+        The returned Future resolves to the raw (success, status, result) from 2Captcha;
+        pass it to finish_async() from the driver's thread to write the answer into the page,
+        or to cancel_async() to abandon it. Manual solving is not supported here, so with
+        2Captcha disabled the Future resolves straight away without submitting anything.
+        """
+        page_url = page_url or driver.current_url
+        captcha_type = (captcha_type or "recaptcha_v2").lower()
+        debug_enabled = self.debug_enabled or force_debug
+
+        if not (self.enabled or force_enable):
+            future = Future()
+            future.set_result((False, "2CAPTCHA DISABLED FOR", page_url))
+            return future
+
+        preparers = {
+            "recaptcha_v2": self._prepare_recaptcha_v2,
+            "normal_captcha": self._prepare_normal_captcha,
+        }
+        preparer = preparers.get(captcha_type)
+        prepared = preparer and preparer(driver, page_url)
+        if not prepared:
+            future = Future()
+            future.set_result((False, f"NO {captcha_type.upper()} FOUND IN", page_url))
+            return future
+
+        solve_callback, result_callback = prepared
+        future = self._executor.submit(
+            self._request_solution, solve_callback, debug_enabled
+        )
+        self._async_callbacks[future] = (result_callback, debug_enabled)
+        return future
+
+    def finish_async(self, future: Future, timeout: float = None):
+        """
+        Waits for a solve_async() Future and applies its answer to the page on the calling thread.
+        """
+        outcome = future.result(timeout=timeout)
+        callback = self._async_callbacks.pop(future, None)
+        if callback:
+            result_callback, debug_enabled = callback
+            outcome = self._apply_solution(outcome, result_callback, debug_enabled)
+
+        success, status, msg = outcome
+        return success, f"{status}: {msg}"
+
+    def cancel_async(self, future: Future):
+        self._async_callbacks.pop(future, None)
+        future.cancel()
 
     def solve(
         self,
@@ -314,7 +709,7 @@ class Captcha:
                 self.save_captcha(
                     driver,
                     os.path.join(
-                        "solved_captchas",
+                        self._solved_dir,
                         f"{captcha_input.get_attribute('value')}.jpeg",
                     ),
                 )
@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+from queue import Queue
+from types import LambdaType
+
+from selenium import webdriver
+
+POOL_SIZE = 4
+MAX_USES_PER_INSTANCE = 50
+
+
+class DriverPool:
+    """
+    Keeps a fixed number of pre-warmed WebDriver sessions so callers do not pay
+    the session start-up cost on every use. Drivers are recycled after max_uses
+    checkouts, or straight away if the caller raised while holding one.
+
+    driver_factory must build drivers the same way the bot does (browser type,
+    driver path, options), see handler.__init__ in website_handler.py.
+    """
+
+    def __init__(
+        self,
+        driver_factory: LambdaType,
+        size: int = POOL_SIZE,
+        max_uses: int = MAX_USES_PER_INSTANCE,
+    ):
+        self.size = size
+        self.max_uses = max_uses
+        self.driver_factory = driver_factory
+        self._q = Queue()
+
+        for _ in range(size):
+            self._q.put([self.driver_factory(), 0])
+
+    def _recycle(self, driver: webdriver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+        try:
+            return [self.driver_factory(), 0]
+        except Exception:
+            # Leave a placeholder so the next acquire() retries the build
+            return [None, 0]
+
+    @contextmanager
+    def acquire(self):
+        entry = self._q.get()
+        if entry[0] is None:
+            try:
+                entry = [self.driver_factory(), 0]
+            except Exception:
+                self._q.put(entry)
+                raise
+
+        driver, uses = entry
+        try:
+            yield driver
+        except Exception:
+            entry = self._recycle(driver)
+            raise
+        else:
+            entry = [driver, uses + 1]
+            if entry[1] >= self.max_uses:
+                entry = self._recycle(driver)
+        finally:
+            self._q.put(entry)
+
+    def close(self):
+        while not self._q.empty():
+            driver, _ = self._q.get_nowait()
+            if driver is None:
+                continue
+            try:
+                driver.quit()
+            except Exception:
+                pass
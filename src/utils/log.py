@@ -69,6 +69,9 @@ class Log:
     def warning(self, *output):
         self.append_stack_if(self.logger.warning, *output)
 
+    def is_error_enabled(self):
+        return self.logger.isEnabledFor(logging.ERROR)
+
     def info_if(self, condition: bool, *output):
         if condition:
             self.info(*output)